@@ -112,12 +112,25 @@ def eval_experiment(
                             f"Please run corresponding experiments ({experiment_info}) before evaluation"
                         ) from index_error
                     try:
-                        with open(
-                            fold_class_latest_path / f"fold_{fold_i}_results.pkl", "rb"
-                        ) as file:
-                            val_proba_np, class_names_in_fold, test_df = pickle.load(
-                                file
-                            )
+                        proba_path = fold_class_latest_path / f"fold_{fold_i}_proba.npy"
+                        if proba_path.exists():
+                            # memory-mapped: only the evaluated columns get paged in
+                            val_proba_np = np.load(proba_path, mmap_mode="r")
+                            with open(
+                                fold_class_latest_path / f"fold_{fold_i}_meta.pkl",
+                                "rb",
+                            ) as file:
+                                class_names_in_fold, test_df = pickle.load(file)
+                        else:  # legacy single-pickle fold results
+                            with open(
+                                fold_class_latest_path / f"fold_{fold_i}_results.pkl",
+                                "rb",
+                            ) as file:
+                                (
+                                    val_proba_np,
+                                    class_names_in_fold,
+                                    test_df,
+                                ) = pickle.load(file)
                         if class_name in class_names_in_fold:
                             if not isinstance(class_names_in_fold, list):
                                 class_names_in_fold = list(class_names_in_fold)
@@ -6,7 +6,10 @@ import inspect
 import logging
 import os.path
 import pickle
+from functools import reduce
+from operator import or_
 
+import numpy as np  # type: ignore
 import pandas as pd  # type: ignore
 from tqdm.auto import tqdm  # type: ignore
 from tqdm.contrib.logging import logging_redirect_tqdm  # type: ignore
@@ -23,6 +26,71 @@ from terpeneminer.src.utils.project_info import (
 logger = logging.getLogger(__file__)
 logger.setLevel(logging.INFO)
 
+# label values marking samples which must not be tagged as isTPS
+NON_TPS_LABELS = {"Unknown", "precursor substr"}
+
+
+def group_labels_by_id(ids: np.ndarray, labels: np.ndarray) -> dict:
+    """
+    Function collecting the set of labels per id in a single vectorized pass
+    (stable argsort + np.unique + np.split) instead of pandas
+    groupby(...).agg(set), which dispatches into Python once per group
+    :param ids: array of sample ids, one entry per label occurrence
+    :param labels: array of labels aligned with ids
+    :return: mapping of each unique id to the set of its labels
+    """
+    order = np.argsort(ids, kind="stable")
+    ids_sorted = ids[order]
+    labels_sorted = labels[order]
+    unique_ids, first_indices = np.unique(ids_sorted, return_index=True)
+    label_groups = np.split(labels_sorted, first_indices[1:])
+    return {
+        id_: set(label_group) for id_, label_group in zip(unique_ids, label_groups)
+    }
+
+
+def tag_tps_labels(id_to_label_sets: dict) -> dict:
+    """
+    Function adding the "isTPS" tag to every label set without
+    the non-TPS markers. The label sets are encoded as uint64 bitmasks
+    over the label vocabulary, so the check-and-tag pass becomes two
+    vectorized bitwise operations instead of per-id set intersections;
+    with over 64 distinct labels it falls back to plain set operations
+    :param id_to_label_sets: mapping of sample ids to their label sets
+    :return: mapping of sample ids to the tagged label sets
+    """
+    vocabulary = set().union(*id_to_label_sets.values()) | NON_TPS_LABELS | {"isTPS"}
+    if len(vocabulary) > 64:
+        return {
+            id_: labels
+            if labels.intersection(NON_TPS_LABELS)
+            else labels.union({"isTPS"})
+            for id_, labels in id_to_label_sets.items()
+        }
+    label_bit = {
+        label: np.uint64(1 << bit_i) for bit_i, label in enumerate(sorted(vocabulary))
+    }
+    non_tps_mask = reduce(or_, (label_bit[label] for label in NON_TPS_LABELS))
+    masks = np.fromiter(
+        (
+            reduce(or_, (label_bit[label] for label in labels), np.uint64(0))
+            for labels in id_to_label_sets.values()
+        ),
+        dtype=np.uint64,
+        count=len(id_to_label_sets),
+    )
+    masks |= np.where(masks & non_tps_mask, np.uint64(0), label_bit["isTPS"])
+    # decoding back to sets, memoized per distinct mask
+    mask_to_labels: dict = {}
+    id_to_labels = {}
+    for id_, mask in zip(id_to_label_sets, masks):
+        labels = mask_to_labels.get(int(mask))
+        if labels is None:
+            labels = {label for label, bit in label_bit.items() if mask & bit}
+            mask_to_labels[int(mask)] = labels
+        id_to_labels[id_] = labels
+    return id_to_labels
+
 
 def run_experiment(experiment_info: ExperimentInfo, load_hyperparameters: bool = False):
     """
@@ -78,6 +146,12 @@ def run_experiment(experiment_info: ExperimentInfo, load_hyperparameters: bool =
 
     # instantiating model
     model = model_class(config)
+    # the folds stay the same for the whole experiment, enumerate them once
+    folds = list(
+        get_folds(
+            split_desc=config.split_col_name,
+        )
+    )
     if load_hyperparameters:
         try:
             per_class_optimization = model.config.per_class_optimization
@@ -90,11 +164,7 @@ def run_experiment(experiment_info: ExperimentInfo, load_hyperparameters: bool =
         # in the future, refactor hyperparameters loading as a common routine used here and in hyperparameter tuning
         # pylint: disable=R0801
         logger.info("Looking for hyperparameters optimization results...")
-        n_folds = len(
-            get_folds(
-                split_desc=config.split_col_name,
-            )
-        )
+        n_folds = len(folds)
         experiment_output_folder_root = (
             get_output_root()
             / experiment_info.model_type
@@ -130,6 +200,11 @@ def run_experiment(experiment_info: ExperimentInfo, load_hyperparameters: bool =
         "Instantiated the model %s", model.config.experiment_info.get_experiment_name()
     )
 
+    # precomputing a contiguous embedding matrix shared across the folds
+    # to avoid re-stacking the object-dtype "Emb" column per fold
+    if getattr(model, "features_df", None) is not None:
+        model.ensure_embedding_matrix()
+
     tps_df = pd.read_csv(config.tps_cleaned_csv_path)
     tps_df.loc[
         tps_df["Type (mono, sesq, di, …)"].isin(
@@ -142,13 +217,35 @@ def run_experiment(experiment_info: ExperimentInfo, load_hyperparameters: bool =
         save_trained_model = config.save_trained_model
     except AttributeError:
         save_trained_model = False
+
+    # precomputing per-id label sets once: the "other" masking of samples
+    # ignored in evaluation and the isTPS tagging do not depend on the fold,
+    # so the per-fold groupby/map passes collapse into per-fold dict lookups
+    labels_masked = tps_df[config.target_col_name].where(
+        tps_df[f"{config.split_col_name}_ignore_in_eval"] != 1, "other"
+    )
+    id_to_labels = tag_tps_labels(
+        group_labels_by_id(
+            tps_df[config.id_col_name].to_numpy(), labels_masked.to_numpy()
+        )
+    )
+    id_to_fold = dict(
+        zip(tps_df[config.id_col_name], tps_df[config.split_col_name])
+    )
+    # aligned id/fold-index arrays, so per-fold train/test id selection
+    # becomes a vectorized comparison instead of a dict scan per fold
+    fold_to_idx = {f"fold_{fold_name}": fold_i for fold_i, fold_name in enumerate(folds)}
+    unique_ids = np.fromiter(id_to_fold.keys(), dtype=object, count=len(id_to_fold))
+    id_fold_idx = np.fromiter(
+        (fold_to_idx.get(fold, -1) for fold in id_to_fold.values()),
+        dtype=np.int8,
+        count=len(id_to_fold),
+    )
     # iterating over folds
     with logging_redirect_tqdm([logger]):
         # pylint: disable=too-many-nested-blocks
         for test_fold in tqdm(
-            get_folds(
-                split_desc=config.split_col_name,
-            ),
+            folds,
             desc=f"Iterating over validation folds per {config.split_col_name}..",
         ):
             # selecting a single fold to run if specified
@@ -156,29 +253,16 @@ def run_experiment(experiment_info: ExperimentInfo, load_hyperparameters: bool =
                 logger.info("Fold: %s", test_fold)
                 fold_needs_resetting = experiment_info.fold == "all_folds"
                 model.config.experiment_info.fold = test_fold
-                trn_folds = [
-                    f"fold_{fold_trn}"
-                    for fold_trn in get_folds(
-                        split_desc=config.split_col_name,
-                    )
-                    if fold_trn != test_fold
-                ]
-                trn_df = tps_df[tps_df[config.split_col_name].isin(set(trn_folds))]
-                trn_df.loc[
-                    trn_df[f"{config.split_col_name}_ignore_in_eval"] == 1,
-                    config.target_col_name,
-                ] = "other"
-                trn_df = (
-                    trn_df.groupby(config.id_col_name)[config.target_col_name]
-                    .agg(set)
-                    .reset_index()
-                )
-                trn_df[config.target_col_name] = trn_df[config.target_col_name].map(
-                    lambda x: x
-                    if len(x.intersection({"Unknown", "precursor substr"}))
-                    else x.union({"isTPS"})
+                test_mask = id_fold_idx == fold_to_idx[f"fold_{test_fold}"]
+                trn_ids = unique_ids[(id_fold_idx >= 0) & ~test_mask]
+                trn_df = pd.DataFrame(
+                    {
+                        config.id_col_name: trn_ids,
+                        config.target_col_name: [id_to_labels[id_] for id_ in trn_ids],
+                    }
                 )
 
+                raw_dataset_id_colunm_name = config.id_col_name
                 if config.run_against_wetlab:
                     test_df_raw = get_tps_df(
                         path_to_file="data/df_wetlab_long_clean.csv",
@@ -187,30 +271,36 @@ def run_experiment(experiment_info: ExperimentInfo, load_hyperparameters: bool =
                         remove_fragments=False,
                     )
                     test_id_column_name = "ID"
-                    raw_dataset_id_colunm_name = config.id_col_name
                     trn_df[test_id_column_name] = trn_df[raw_dataset_id_colunm_name]
                     tps_df[test_id_column_name] = tps_df[raw_dataset_id_colunm_name]
                     model.config.id_col_name = test_id_column_name
+                    id_to_test_labels = tag_tps_labels(
+                        group_labels_by_id(
+                            test_df_raw[test_id_column_name].to_numpy(),
+                            test_df_raw[config.target_col_name].to_numpy(),
+                        )
+                    )
+                    test_df = pd.DataFrame(
+                        {
+                            test_id_column_name: list(id_to_test_labels),
+                            config.target_col_name: list(id_to_test_labels.values()),
+                        }
+                    )
                 else:
                     test_df_raw = tps_df[
                         tps_df[config.split_col_name] == f"fold_{test_fold}"
                     ]
-                    test_df_raw.loc[
-                        test_df_raw[f"{config.split_col_name}_ignore_in_eval"] == 1,
-                        config.target_col_name,
-                    ] = "other"
                     test_id_column_name = config.id_col_name
                     model.config.id_col_name = test_id_column_name
-                test_df = (
-                    test_df_raw.groupby(test_id_column_name)[config.target_col_name]
-                    .agg(set)
-                    .reset_index()
-                )
-                test_df[config.target_col_name] = test_df[config.target_col_name].map(
-                    lambda x: x
-                    if len(x.intersection({"Unknown", "precursor substr"}))
-                    else x.union({"isTPS"})
-                )
+                    test_ids = unique_ids[test_mask]
+                    test_df = pd.DataFrame(
+                        {
+                            test_id_column_name: test_ids,
+                            config.target_col_name: [
+                                id_to_labels[id_] for id_ in test_ids
+                            ],
+                        }
+                    )
 
                 # checking if the model requires an amino acid sequence or a group (kingdom) column
                 for optional_column_attribute in ["seq_col_name", "group_column_name"]:
@@ -292,11 +382,21 @@ def run_experiment(experiment_info: ExperimentInfo, load_hyperparameters: bool =
                 if save_trained_model:
                     model.save()
 
-                # scoring the model
+                # scoring the model; the probability matrix is stored as .npy
+                # so that downstream evaluation can open it with mmap_mode="r"
+                # and page in only the rows it touches
                 val_proba_np = model.predict_proba(test_df)
+                np.save(
+                    model.output_root / f"fold_{test_fold}_proba.npy",
+                    val_proba_np.astype(np.float32, copy=False),
+                )
                 with open(
-                    model.output_root / f"fold_{test_fold}_results.pkl", "wb"
+                    model.output_root / f"fold_{test_fold}_meta.pkl", "wb"
                 ) as file:
-                    pickle.dump((val_proba_np, model.config.class_names, test_df), file)
+                    pickle.dump(
+                        (list(model.config.class_names), test_df),
+                        file,
+                        protocol=5,
+                    )
                 if fold_needs_resetting:
                     experiment_info.fold = "all_folds"
@@ -1,6 +1,8 @@
 """This module defines an abstract class for model configs"""
 
-from dataclasses import dataclass
+import copy
+import functools
+from dataclasses import dataclass, fields
 from pathlib import Path
 from typing import Union
 
@@ -8,8 +10,42 @@ import yaml  # type: ignore
 
 from terpeneminer.src.utils.project_info import ExperimentInfo
 
+# libyaml-backed loader is ~10x faster when the C extension is available
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-@dataclass(kw_only=True)
+
+@functools.lru_cache(maxsize=None)
+def _load_yaml(path_to_config: str) -> dict:
+    """
+    This function loads (and memoizes by path) a config yaml
+    with its optionally included file merged in
+    :param path_to_config: path to the config yaml
+    :return: a dictionary loaded from the config yaml
+    """
+    with open(path_to_config, encoding="utf-8") as file:
+        configs_dict = yaml.load(file, Loader=_YAML_LOADER)
+        configs_dict = {
+            key: val if val != "None" else None for key, val in configs_dict.items()
+        }
+        if "include" in configs_dict:
+            included_file_path = configs_dict.pop("include")
+            with open(
+                Path(path_to_config).parent / included_file_path,
+                "r",
+                encoding="utf-8",
+            ) as included_file:
+                included_data = yaml.load(included_file, Loader=_YAML_LOADER)
+                configs_dict.update(
+                    {
+                        key: val if val != "None" else None
+                        for key, val in included_data.items()
+                        if key not in configs_dict
+                    }
+                )
+    return configs_dict
+
+
+@dataclass(kw_only=True, slots=True)
 class BaseConfig:
     """
     A data class to store model attributes
@@ -39,30 +75,23 @@ class BaseConfig:
         :param path_to_config:
         :return: a dictionary loaded from the config yaml
         """
-        with open(path_to_config, encoding="utf-8") as file:
-            configs_dict = yaml.load(file, Loader=yaml.FullLoader)
-            configs_dict = {
-                key: val if val != "None" else None for key, val in configs_dict.items()
-            }
-            if "include" in configs_dict:
-                included_file_path = configs_dict.pop("include")
-                with open(
-                    Path(path_to_config).parent / included_file_path,
-                    "r",
-                    encoding="utf-8",
-                ) as included_file:
-                    included_data = yaml.safe_load(included_file)
-                    configs_dict.update(
-                        {
-                            key: val if val != "None" else None
-                            for key, val in included_data.items()
-                            if key not in configs_dict
-                        }
-                    )
-        return configs_dict
-
-
-@dataclass
+        # deepcopy so that callers can mutate the dict without
+        # corrupting the memoized copy
+        return copy.deepcopy(_load_yaml(str(path_to_config)))
+
+    def to_dict(self) -> dict:
+        """
+        This function returns a shallow mapping of all config attributes:
+        the declared dataclass fields (slot-backed in the base classes) and
+        any attributes attached dynamically to a non-slotted subclass
+        :return: a dictionary of attribute names to values
+        """
+        attributes = {field.name: getattr(self, field.name) for field in fields(self)}
+        attributes.update(getattr(self, "__dict__", {}))
+        return attributes
+
+
+@dataclass(slots=True)
 class SklearnBaseConfig(BaseConfig):
     """
     A data class to store scikit-learn downstream models leveraging precomputed embeddings
@@ -72,7 +101,7 @@ class SklearnBaseConfig(BaseConfig):
     save_trained_model: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class EmbSklearnBaseConfig(SklearnBaseConfig):
     """
     A data class to store the corresponding model attributes
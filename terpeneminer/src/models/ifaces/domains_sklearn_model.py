@@ -52,7 +52,7 @@ class DomainsSklearnModel(FeaturesSklearnModel):
 
     def __init__(self, config: SklearnBaseConfig):
         super().__init__(config=config)
-        for param, value in config.__dict__.items():
+        for param, value in config.to_dict().items():
             setattr(self, param, value)
         self.config = config
         with open("data/clustering__domain_dist_based_features.pkl", "rb") as file:
@@ -86,13 +86,17 @@ class DomainsSklearnModel(FeaturesSklearnModel):
             (self.features_df_domain_detections, features_df_no_detected_domains)
         )
 
-    def fit_core(self, train_df: pd.DataFrame, class_name: str = None):
+    def prepare_features(self, train_df: pd.DataFrame):
+        """
+        Function rebuilding self.features_df from comparisons to domains
+        of the training proteins only, to avoid leakage
+        :param train_df: pandas dataframe containing training data
+        """
         (
             self.allowed_feat_indices,
             self.features_df_domain_detections,
         ) = compare_domains_to_known_instances(train_df, self)
         self._setup_features_df_for_current_data(train_df)
-        super().fit_core(train_df, class_name)
 
     def predict_proba(
         self, val_df: pd.DataFrame, selected_class_name: Optional[str] = None
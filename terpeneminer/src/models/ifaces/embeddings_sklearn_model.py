@@ -1,6 +1,7 @@
 """An abstract class inheriting from FeaturesSklearnModel, where features are protein language model (PLM) embeddings"""
 import os.path
 
+import numpy as np  # type: ignore
 import pandas as pd  # type: ignore
 
 from .config_baseclasses import EmbSklearnBaseConfig
@@ -14,7 +15,7 @@ class EmbsSklearnModel(FeaturesSklearnModel):
 
     def __init__(self, config: EmbSklearnBaseConfig):
         super().__init__(config=config)
-        for param, value in config.__dict__.items():
+        for param, value in config.to_dict().items():
             setattr(self, param, value)
         representations_path: str = config.representations_path
         if not os.path.exists(representations_path):
@@ -22,10 +23,54 @@ class EmbsSklearnModel(FeaturesSklearnModel):
                 f"File with pre-computed embeddings {representations_path} does not exist"
             )
 
-        self.features_df: pd.DataFrame = pd.read_hdf(representations_path)
-        assert isinstance(self.features_df, pd.DataFrame), (
-            "Expected embeddings to be stored as pandas Dataframe"
-            f"But {type(self.features_df)} found at {representations_path}"
-        )
-        self.features_df.drop_duplicates(subset=[self.config.id_col_name], inplace=True)
-        self.features_df.columns = [self.config.id_col_name, "Emb"]
+        if representations_path.endswith(".npy"):
+            # pre-converted embeddings (e.g. the .emb.npy/.ids.npy sidecars
+            # written by _memmap_converted_embeddings): memory-map the matrix
+            # so that forked joblib workers share the OS page cache instead
+            # of each holding a private copy. The dataframe then carries the
+            # ids only, so this fast path is for models consuming embeddings
+            # exclusively through the matrix; models needing the per-row
+            # "Emb" column must point at the original embeddings file
+            ids = np.load(
+                f"{representations_path[: -len('.npy')]}.ids.npy", allow_pickle=True
+            )
+            self.features_df = pd.DataFrame({self.config.id_col_name: ids})
+            self.attach_embedding_matrix(
+                np.load(representations_path, mmap_mode="r"), ids
+            )
+        else:
+            self.features_df: pd.DataFrame = pd.read_hdf(representations_path)
+            assert isinstance(self.features_df, pd.DataFrame), (
+                "Expected embeddings to be stored as pandas Dataframe"
+                f"But {type(self.features_df)} found at {representations_path}"
+            )
+            self.features_df.drop_duplicates(
+                subset=[self.config.id_col_name], inplace=True
+            )
+            self.features_df.columns = [self.config.id_col_name, "Emb"]
+            self._memmap_converted_embeddings(representations_path)
+
+    def _memmap_converted_embeddings(self, representations_path: str):
+        """
+        Function converting the loaded object-dtype embeddings into sidecar
+        .npy files once (matrix + row ids) and re-opening the matrix
+        memory-mapped; subsequent runs and forked workers then share
+        the mapped pages
+        :param representations_path: path to the original embeddings file
+        """
+        converted_path = f"{representations_path}.emb.npy"
+        ids_path = f"{representations_path}.emb.ids.npy"
+        ids = self.features_df[self.config.id_col_name].to_numpy()
+        conversion_needed = True
+        if os.path.exists(converted_path) and os.path.exists(ids_path):
+            stored_ids = np.load(ids_path, allow_pickle=True)
+            conversion_needed = len(stored_ids) != len(ids) or bool(
+                (stored_ids != ids).any()
+            )
+        if conversion_needed:
+            np.save(
+                converted_path,
+                np.stack(self.features_df["Emb"].values).astype(np.float32),
+            )
+            np.save(ids_path, ids)
+        self.attach_embedding_matrix(np.load(converted_path, mmap_mode="r"), ids)
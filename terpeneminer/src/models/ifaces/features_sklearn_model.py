@@ -1,13 +1,15 @@
 """Module with interfaces for scikit-learn-compatible predictive models
 built on top of numerical protein representations (features)"""
 import logging
+import os
 from typing import Optional
 
 import numpy as np  # type: ignore
 import pandas as pd  # type: ignore
 import sklearn.base  # type: ignore
+from joblib import Parallel, delayed  # type: ignore
+from scipy import sparse  # type: ignore
 from sklearn.multioutput import MultiOutputClassifier  # type: ignore
-from sklearn.preprocessing import MultiLabelBinarizer  # type: ignore
 
 from .config_baseclasses import SklearnBaseConfig
 from .model_baseclass import BaseModel
@@ -16,6 +18,28 @@ logger = logging.getLogger(__file__)
 logger.setLevel(logging.INFO)
 
 
+def _fit_one_class(
+    classifier_class: type,
+    class_name: str,
+    model_params: dict,
+    embs: np.ndarray,
+    target,
+) -> tuple[str, sklearn.base.BaseEstimator]:
+    """
+    Function fitting a single per-class estimator; kept at module level
+    to be picklable by joblib worker processes
+    :param classifier_class: scikit-learn-compatible estimator class
+    :param class_name: name of the class the estimator is fit for
+    :param model_params: estimator constructor parameters
+    :param embs: numerical protein representations (features)
+    :param target: binary vector or multi-label indicator matrix
+    :return: tuple of the class name and the fitted estimator
+    """
+    classifier = classifier_class(**model_params)
+    classifier.fit(embs, target)
+    return class_name, classifier
+
+
 class FeaturesSklearnModel(BaseModel):
     """Interfaces for scikit-learn-compatible predictive models
     built on top of numerical protein representations (features)"""
@@ -40,18 +64,140 @@ class FeaturesSklearnModel(BaseModel):
         self.classifier: sklearn.base.BaseEstimator
         self.classes_ = None
         self.features_df = None
+        self.emb_matrix: Optional[np.ndarray] = None
+        self.id_to_row: Optional[dict] = None
+        self._avg_emb: Optional[np.ndarray] = None
+        self._emb_source_df: Optional[pd.DataFrame] = None
 
-    def fit_core(self, train_df: pd.DataFrame, class_name: str = None):
-        logger.info("Started fitting the model %s", self.__class__)
-        assert isinstance(
-            self.config, SklearnBaseConfig
-        ), "EmbsSklearnModel model expects config of type SklearnBaseConfig"
-        train_df_neg_all = train_df[
-            train_df[self.config.target_col_name].map(
-                lambda classes: self.config.neg_val in classes
+    def build_embedding_matrix(self):
+        """
+        Function converting the object-dtype "Emb" column of self.features_df
+        into a contiguous float32 matrix with a parallel id-to-row index and
+        a cached average embedding, so that downstream access is a single
+        fancy-index gather instead of per-row Python iteration
+        """
+        assert (
+            self.features_df is not None
+        ), "self.features_df has not been initialized!"
+        self.emb_matrix = np.ascontiguousarray(
+            np.stack(self.features_df["Emb"].values).astype(np.float32)
+        )
+        self.id_to_row = {
+            id_: row_i
+            for row_i, id_ in enumerate(
+                self.features_df[self.config.id_col_name].values
             )
-        ]
-        negs_proportion = len(train_df_neg_all) / len(train_df)
+        }
+        self._avg_emb = self.emb_matrix.mean(axis=0)
+        self._emb_source_df = self.features_df
+
+    def attach_embedding_matrix(self, emb_matrix: np.ndarray, ids):
+        """
+        Function attaching an already materialized - typically memory-mapped -
+        embedding matrix together with its row ids, bypassing the conversion
+        done by build_embedding_matrix
+        :param emb_matrix: 2D embedding matrix, one row per id
+        :param ids: sample ids aligned with the matrix rows
+        """
+        self.emb_matrix = emb_matrix
+        self.id_to_row = {id_: row_i for row_i, id_ in enumerate(ids)}
+        self._avg_emb = np.asarray(emb_matrix.mean(axis=0), dtype=np.float32)
+        self._emb_source_df = self.features_df
+
+    def ensure_embedding_matrix(self):
+        """
+        Function (re)building the embedding matrix lazily; models rebuilding
+        self.features_df per fit/predict call get a fresh matrix automatically
+        """
+        if self.emb_matrix is None or self._emb_source_df is not self.features_df:
+            self.build_embedding_matrix()
+
+    def embeddings_for(self, ids) -> np.ndarray:
+        """
+        Function gathering the embeddings of the given sample ids;
+        ids without a precomputed embedding get the average embedding
+        :param ids: iterable of sample ids
+        :return: 2D numpy array with the embeddings
+        """
+        self.ensure_embedding_matrix()
+        assert self.id_to_row is not None and self.emb_matrix is not None
+        rows = np.fromiter(
+            (self.id_to_row.get(id_, -1) for id_ in ids),
+            dtype=np.int64,
+            count=len(ids),
+        )
+        missing = rows < 0
+        rows[missing] = 0
+        embs = self.emb_matrix[rows]
+        if missing.any():
+            embs[missing] = self._avg_emb
+        return embs
+
+    def _stack_embeddings(self, data_df: pd.DataFrame) -> np.ndarray:
+        """
+        Function gathering the embeddings of the dataframe samples
+        :param data_df: dataframe with an id column
+        :return: 2D numpy array with the embeddings
+        """
+        return self.embeddings_for(data_df[self.config.id_col_name].values)
+
+    def prepare_features(self, train_df: pd.DataFrame):
+        """
+        Hook (re)building self.features_df from the training data of the
+        current fit call; models deriving their features from training
+        samples only (to avoid leakage) override it. It is invoked by both
+        fit_core and fit_classes before any feature access, so the parallel
+        per-class path sees the same features as the sequential one.
+        By default the features are static and nothing needs to be done
+        :param train_df: pandas dataframe containing training data
+        """
+
+    def supports_multioutput(self) -> bool:
+        """
+        Function deciding up front whether the underlying estimator can fit
+        a multi-label indicator matrix natively; subclasses whose estimator
+        never can may simply override it to return False
+        :return: True when no MultiOutputClassifier wrapper is needed
+        """
+        try:
+            return not self.config.requires_multioutputwrapper_for_multilabel  # type: ignore
+        except AttributeError:
+            return True
+
+    def _binarize_labels(self, label_sets) -> sparse.csr_matrix:
+        """
+        Function building a multi-label indicator matrix for the configured classes
+        :param label_sets: iterable of per-sample label sets
+        :return: sparse indicator matrix of shape (n_samples, n_classes)
+        """
+        class_2_idx = {
+            class_name: class_i
+            for class_i, class_name in enumerate(self.config.class_names)
+        }
+        rows, cols = [], []
+        for row_i, label_set in enumerate(label_sets):
+            for label in label_set:
+                col_i = class_2_idx.get(label)
+                if col_i is not None:
+                    rows.append(row_i)
+                    cols.append(col_i)
+        return sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int8), (rows, cols)),
+            shape=(len(label_sets), len(class_2_idx)),
+        )
+
+    def _subsample_negatives(self, train_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Function downsampling negative samples to the configured maximal proportion
+        :param train_df: pandas dataframe containing training data
+        :return: training dataframe with the satisfied constraint on the negatives proportion
+        """
+        neg_mask = (
+            train_df[self.config.target_col_name]
+            .map(lambda classes: self.config.neg_val in classes)
+            .to_numpy()
+        )
+        negs_proportion = neg_mask.mean()
         if negs_proportion > self.config.max_train_negs_proportion:
             positive_count = train_df[self.config.id_col_name].nunique() * (
                 1 - negs_proportion
@@ -60,106 +206,151 @@ class FeaturesSklearnModel(BaseModel):
                 positive_count / (1 - self.config.max_train_negs_proportion)
                 - positive_count
             )
-            train_df_pos = train_df[
-                train_df[self.config.target_col_name].map(
-                    lambda classes: self.config.neg_val not in classes
+            # a single positional take instead of three intermediate
+            # dataframes and a double shuffle
+            rng = np.random.default_rng(self.config.random_state)
+            chosen_indices = np.concatenate(
+                (
+                    np.flatnonzero(~neg_mask),
+                    rng.choice(
+                        np.flatnonzero(neg_mask),
+                        size=int(required_negs_count),
+                        replace=False,
+                    ),
                 )
-            ]
-            train_df_neg = train_df_neg_all.sample(int(required_negs_count))
-            train_df = pd.concat((train_df_pos, train_df_neg)).sample(frac=1.0)
+            )
+            rng.shuffle(chosen_indices)
+            train_df = train_df.iloc[chosen_indices]
+        return train_df
+
+    def _prepare_class_fit(
+        self, class_name: str, train_data: pd.DataFrame
+    ) -> Optional[tuple[dict, np.ndarray]]:
+        """
+        Function preparing per-class estimator parameters and the corresponding target
+        :param class_name: name of a class for the separate model fitting for the class
+        :param train_data: training dataframe already merged with the features
+        :return: tuple of the estimator parameters and the target,
+                 or None when the class has no positive samples
+        """
+        model_specific_params = self.get_model_specific_params(class_name=class_name)
+        if not any(class_name in param_name for param_name in model_specific_params):
+            raise ValueError(
+                f"During per-class optimization class {class_name} had no parameters specified."
+            )
+        class_prefix = f"{class_name}_"
+        model_params = {
+            param_name.removeprefix(class_prefix): param_val
+            for param_name, param_val in model_specific_params.items()
+        }
+        if self.per_class_with_multilabel_regularization:
+            logger.info("Preparing multi-labels during per class optimization...")
+            target = self._binarize_labels(
+                train_data[self.config.target_col_name].values
+            ).toarray()
+            return model_params, target
+        y_binary = (
+            train_data[self.config.target_col_name]
+            .map(lambda x: int(class_name in x))
+            .values
+        )
+        if not y_binary.sum():
+            return None
+        return model_params, y_binary
 
+    def fit_classes(self, train_df: pd.DataFrame, class_names: list[str]):
+        """
+        Function fitting independent per-class estimators concurrently:
+        the per-class fits share the same features and only differ in
+        parameters and targets, so they are embarrassingly parallel
+        :param train_df: pandas dataframe containing training data
+        :param class_names: names of the classes to fit estimators for
+        """
+        logger.info("Started fitting per-class models %s", self.__class__)
+        self.prepare_features(train_df)
         assert (
             self.features_df is not None
         ), "self.features_df has not been initialized!"
-        logger.info("In fit(), features DF shape is: %d x %d", *self.features_df.shape)
+        train_df = self._subsample_negatives(train_df)
+        self.ensure_embedding_matrix()
+        train_data = train_df[
+            train_df[self.config.id_col_name].isin(self.id_to_row)
+        ]
+        embs = self._stack_embeddings(train_data)
+        class_fit_inputs = [
+            (class_name, self._prepare_class_fit(class_name, train_data))
+            for class_name in class_names
+        ]
+        results = Parallel(n_jobs=os.cpu_count(), backend="loky")(
+            delayed(_fit_one_class)(
+                self.classifier_class,
+                class_name,
+                model_params_and_target[0],
+                embs,
+                model_params_and_target[1],
+            )
+            for class_name, model_params_and_target in class_fit_inputs
+            if model_params_and_target is not None
+        )
+        for class_name, classifier in results:
+            self.class_2_classifier[class_name] = classifier
+
+    def fit_core(self, train_df: pd.DataFrame, class_name: str = None):
+        logger.info("Started fitting the model %s", self.__class__)
+        assert isinstance(
+            self.config, SklearnBaseConfig
+        ), "EmbsSklearnModel model expects config of type SklearnBaseConfig"
+        self.prepare_features(train_df)
+        train_df = self._subsample_negatives(train_df)
+
+        assert (
+            self.features_df is not None
+        ), "self.features_df has not been initialized!"
+        self.ensure_embedding_matrix()
         logger.info(
-            "In fit(), features dimension is: %d",
-            self.features_df["Emb"].values[0].shape[0],
+            "In fit(), features matrix shape is: %d x %d", *self.emb_matrix.shape
         )
-        train_data = train_df.merge(self.features_df, on=self.config.id_col_name)
+        train_data = train_df[
+            train_df[self.config.id_col_name].isin(self.id_to_row)
+        ]
 
         if not self.per_class_optimization:
-            try:
-                requires_multioutputwrapper_for_multilabel = (
-                    self.config.requires_multioutputwrapper_for_multilabel  # type: ignore
-                )
-            except AttributeError:
-                requires_multioutputwrapper_for_multilabel = False
-            if requires_multioutputwrapper_for_multilabel:
-                self.classifier = MultiOutputClassifier(
-                    self.classifier_class(**self.get_model_specific_params())
-                )
-            else:
-                self.classifier = self.classifier_class(
-                    **self.get_model_specific_params()
+            model_params = self.get_model_specific_params()
+            classifier = self.classifier_class(**model_params)
+            if not self.supports_multioutput():
+                classifier = MultiOutputClassifier(
+                    classifier, n_jobs=model_params.get("n_jobs", -1)
                 )
-            label_binarizer = MultiLabelBinarizer(classes=self.config.class_names)
+            self.classifier = classifier
             logger.info("Preparing multi-labels...")
-            target = label_binarizer.fit_transform(
+            # both MultiOutputClassifier and native multi-output estimators
+            # require a dense y, so the sparse indicator matrix is densified
+            # right before fitting
+            target = self._binarize_labels(
                 train_data[self.config.target_col_name].values
-            )
+            ).toarray()
             logger.info("Fitting the model...")
 
             self.classifier.fit(
-                np.stack(train_data["Emb"].values),
+                self._stack_embeddings(train_data),
                 target,
             )
-            self.config.class_names = label_binarizer.classes_
         else:
             assert (
                 class_name is not None
             ), "For per-class fitting the class name must be provided"
-            model_specific_params = list(
-                self.get_model_specific_params(class_name=class_name).items()
-            )
-            model_params = {
-                param_name.replace(f"{class_name}_", ""): param_val
-                for param_name, param_val in model_specific_params
-            }
-            is_class_specific_param_present = False
-            for param_name, _ in model_specific_params:
-                if class_name in param_name:
-                    is_class_specific_param_present = True
-                    break
-            if is_class_specific_param_present:
-                classifier = self.classifier_class(**model_params)
-                if self.per_class_with_multilabel_regularization:
-                    label_binarizer = MultiLabelBinarizer(
-                        classes=self.config.class_names
-                    )
-                    logger.info(
-                        "Preparing multi-labels during per class optimization..."
-                    )
-                    target = label_binarizer.fit_transform(
-                        train_data[self.config.target_col_name].values
-                    )
-                    logger.info(
-                        "Fitting the model (multi-label) for class %s...", class_name
-                    )
-
-                    classifier.fit(
-                        np.stack(train_data["Emb"].values),
-                        target,
-                    )
-                    self.class_2_classifier[class_name] = classifier
-                    self.config.class_names = label_binarizer.classes_
-                else:
-                    y_binary = train_data[self.config.target_col_name].map(
-                        lambda x: int(class_name in x)
-                    )
-                    if sum(y_binary):
-                        logger.info(
-                            "Fitting the model (binary) for class %s...", class_name
-                        )
-                        classifier.fit(
-                            np.stack(train_data["Emb"].values),
-                            y_binary,
-                        )
-                        self.class_2_classifier[class_name] = classifier
-            else:
-                raise ValueError(
-                    f"During per-class optimization class {class_name} had no parameters specified."
+            model_params_and_target = self._prepare_class_fit(class_name, train_data)
+            if model_params_and_target is not None:
+                model_params, target = model_params_and_target
+                logger.info("Fitting the model for class %s...", class_name)
+                _, classifier = _fit_one_class(
+                    self.classifier_class,
+                    class_name,
+                    model_params,
+                    self._stack_embeddings(train_data),
+                    target,
                 )
+                self.class_2_classifier[class_name] = classifier
 
     def predict_proba(
         self,
@@ -168,24 +359,16 @@ class FeaturesSklearnModel(BaseModel):
     ) -> np.ndarray:
         if isinstance(val_df, pd.DataFrame):  # local validation
             assert isinstance(self.features_df, pd.DataFrame)
-            test_df = val_df.merge(
-                self.features_df, on=self.config.id_col_name, copy=False, how="left"
-            ).set_index(self.config.id_col_name)
+            self.ensure_embedding_matrix()
             logger.info(
-                "In predict_proba(), features DF shape is: %d x %d",
-                *self.features_df.shape,
+                "In predict_proba(), features matrix shape is: %d x %d",
+                *self.emb_matrix.shape,
             )
-            logger.info(
-                "In predict_proba(), features dimension is: %d",
-                self.features_df["Emb"].values[0].shape[0],
+            # a single gather in val_df order; ids without a precomputed
+            # embedding get the cached average embedding
+            test_embs_np = self.embeddings_for(
+                val_df[self.config.id_col_name].values
             )
-
-            average_emb = np.stack(self.features_df["Emb"].values).mean(axis=0)
-            test_df["Emb"] = test_df["Emb"].map(
-                lambda x: x if isinstance(x, np.ndarray) else average_emb
-            )
-            test_df = test_df.loc[val_df[self.config.id_col_name]]
-            test_embs_np = np.stack(test_df["Emb"].values)
         elif isinstance(val_df, np.ndarray):  # test-time prediction
             test_embs_np = val_df
         else:
@@ -197,7 +380,6 @@ class FeaturesSklearnModel(BaseModel):
             per_class_optimization = self.config.per_class_optimization
         except AttributeError:
             per_class_optimization = False
-        val_proba_np = np.zeros((len(val_df), len(self.config.class_names)))
         if not per_class_optimization:
             logger.info(
                 "Global model %s predicts proba for %d samples (%d features each)",
@@ -205,13 +387,20 @@ class FeaturesSklearnModel(BaseModel):
                 *test_embs_np.shape,
             )
             y_pred_proba = self.classifier.predict_proba(test_embs_np)
-            for class_i in range(len(self.config.class_names)):
-                val_proba_np[:, class_i] = (
-                    y_pred_proba[class_i][:, -1]
-                    if isinstance(y_pred_proba, list)
-                    else y_pred_proba[:, class_i]
+            if isinstance(y_pred_proba, list):
+                # one (n_samples, 2) array per class, e.g. from MultiOutputClassifier:
+                # fill the columns of a single pre-allocated matrix
+                val_proba_np = np.empty(
+                    (len(val_df), len(y_pred_proba)), dtype=np.float32
                 )
+                for class_i, class_proba in enumerate(y_pred_proba):
+                    val_proba_np[:, class_i] = class_proba[:, -1]
+            else:
+                val_proba_np = y_pred_proba.astype(np.float32, copy=False)
         else:
+            val_proba_np = np.zeros(
+                (len(val_df), len(self.config.class_names)), dtype=np.float32
+            )
             for class_i, class_name in enumerate(self.config.class_names):
                 if (
                     selected_class_name is None or class_name == selected_class_name
@@ -70,7 +70,8 @@ class BaseModel(ABC, BaseEstimator):
             / f"model_fold_{self.config.experiment_info.fold}.pkl",
             "wb",
         ) as file:
-            pickle.dump(self, file)
+            # protocol 5 frames large numpy buffers efficiently
+            pickle.dump(self, file, protocol=5)
 
     def fit(self, train_df: pd.DataFrame):
         """
@@ -125,11 +126,20 @@ class BaseModel(ABC, BaseEstimator):
                 if not hasattr(self.config, "class_name")
                 else [self.config.class_name]
             )
-            for class_name in class_names:
-                self.fit_core(train_df, class_name=class_name)
+            self.fit_classes(train_df, class_names)
         else:
             self.fit_core(train_df)
 
+    def fit_classes(self, train_df: pd.DataFrame, class_names: list[str]):
+        """
+        Function fitting a separate model per class; subclasses with
+        independent per-class fits may override it to train classes concurrently
+        :param train_df: pandas dataframe containing training data
+        :param class_names: names of the classes to fit separate models for
+        """
+        for class_name in class_names:
+            self.fit_core(train_df, class_name=class_name)
+
     @abstractmethod
     def predict_proba(
         self,
@@ -409,11 +419,15 @@ class BaseModel(ABC, BaseEstimator):
             )
         }
 
-    def get_model_specific_params(self, class_name: str = None):
+    def _get_classifier_attributes(self) -> set:
         """
-        method inspecting parameters and retrieving ones related to the model object
+        method retrieving the constructor parameter names of the classifier class;
+        the signature inspection (or the fallback instantiation) is done once
+        per model and cached, as the classifier class never changes
         """
-        initial_instance_parameters = self.__dict__
+        cached_attributes = getattr(self, "_classifier_attributes", None)
+        if cached_attributes is not None:
+            return cached_attributes
         try:
             classifier_args = inspect.getfullargspec(self.classifier_class)
             if isinstance(classifier_args.kwonlydefaults, dict):
@@ -427,7 +441,16 @@ class BaseModel(ABC, BaseEstimator):
             # (e.g. it's the case for sklearn wrapper of xgboost),
             # then fallback to default constructor
             instance = self.classifier_class()
-            classifier_attributes = instance.__dict__
+            classifier_attributes = set(instance.__dict__)
+        self._classifier_attributes = classifier_attributes
+        return classifier_attributes
+
+    def get_model_specific_params(self, class_name: str = None):
+        """
+        method inspecting parameters and retrieving ones related to the model object
+        """
+        initial_instance_parameters = self.__dict__
+        classifier_attributes = self._get_classifier_attributes()
         return {
             key: val
             for key, val in initial_instance_parameters.items()
@@ -39,6 +39,12 @@ class PlmDomainsRandomForest(PlmRandomForest):
                 _,
             ) = pickle.load(file)
         self.allowed_feat_indices: list[int] = None  # type: ignore
+        assert "Emb" in self.features_df.columns, (
+            "PlmDomainsRandomForest concatenates the per-row PLM embeddings "
+            "with the domain features and therefore requires the original "
+            "embeddings file as representations_path, not a pre-converted "
+            ".npy matrix"
+        )
         self.features_df_plm = self.features_df.copy()
         self.features_df = None
         # to experiment with the domain features subset
@@ -50,11 +56,11 @@ class PlmDomainsRandomForest(PlmRandomForest):
         else:
             self.feat_indices_subset = None
 
-    def fit_core(self, train_df: pd.DataFrame, class_name: str = None):
+    def prepare_features(self, train_df: pd.DataFrame):
         """
-        Function for training model instance
+        Function rebuilding self.features_df by concatenating the PLM
+        embeddings with domain-comparison features of the training proteins
         :param train_df: pandas dataframe containing training data
-        :param class_name: name of a class for the separate model fitting for the class
         """
         # comparisons to domains of trn proteins only to avoid leakage
         (
@@ -83,8 +89,6 @@ class PlmDomainsRandomForest(PlmRandomForest):
         )
         self.features_df.drop("Emb_dom", axis=1, inplace=True)
 
-        super().fit_core(train_df, class_name)
-
     @classmethod
     def config_class(cls) -> Type[BaseConfig]:
         """
@@ -5,15 +5,32 @@ import json
 import logging
 import os
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import pandas as pd  # type: ignore
 from tqdm import tqdm  # type: ignore
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # orjson is optional, stdlib json is a drop-in fallback
+    orjson = None  # type: ignore
+
 logger = logging.getLogger(__file__)
 logger.setLevel(logging.INFO)
 
 
+def read_detection_file(detected_file: Path) -> tuple[str, dict]:
+    """
+    This function reads a single JSON file with per-class detection probabilities
+    :param detected_file: path to the JSON file
+    :return: a tuple of the file name and the parsed content
+    """
+    raw_content = detected_file.read_bytes()
+    content = orjson.loads(raw_content) if orjson is not None else json.loads(raw_content)
+    return detected_file.name, content
+
+
 def parse_args() -> argparse.Namespace:
     """
     This function parses arguments
@@ -51,16 +68,25 @@ if __name__ == "__main__":
     ids = []
     predicted_class_2_vals = defaultdict(list)
 
-    processed_files = []
-    all_files = [file for file in screening_results_root.glob("*") if file.is_file()]
-    for detected_file in tqdm(all_files, desc="Processing detection files"):
-        if ".csv" not in detected_file.name:
-            with open(detected_file, "r", encoding="utf-8") as file:
-                content = json.load(file)
-            ids.append(detected_file.name)
-            for class_name, prob in content.items():
-                predicted_class_2_vals[class_name].append(prob)
-            processed_files.append(str(detected_file))
+    detection_files = [
+        file
+        for file in screening_results_root.glob("*")
+        if file.is_file() and ".csv" not in file.name
+    ]
+    # reading is I/O-bound, so the files are parsed by a thread pool
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        results = list(
+            tqdm(
+                executor.map(read_detection_file, detection_files),
+                total=len(detection_files),
+                desc="Processing detection files",
+            )
+        )
+    for file_name, content in results:
+        ids.append(file_name)
+        for class_name, prob in content.items():
+            predicted_class_2_vals[class_name].append(prob)
+    processed_files = [str(detected_file) for detected_file in detection_files]
 
     predicted_class_2_vals.update({"ID": ids})
     df_detections = pd.DataFrame(predicted_class_2_vals)